@@ -1,7 +1,10 @@
-from sklearn.cluster import KMeans
-from sklearn.preprocessing import StandardScaler
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from threadpoolctl import threadpool_limits
+import numpy as np
 import pandas as pd
+import psutil
 from sqlite3 import Connection
+from typing import Optional
 
 class Classifier:
     """
@@ -9,20 +12,56 @@ class Classifier:
     Uses KMeans clustering algorithm on selected nutritional features to group items.
     """
     
-    def __init__(self, conn: Connection, n_clusters: int = 3):
+    FEATURES = ('calories', 'total_fat', 'sugar', 'total_carb', 'protein', 'calcium', 'fiber')
+
+    def __init__(self, conn: Connection, n_clusters: int = 3, use_minibatch: bool = False):
         """
         Initialize the classifier with the database connection and clustering settings.
 
         Args:
             conn (Connection): Database connection.
             n_clusters (int): Number of clusters for KMeans (default is 3 for 'Main', 'Side', 'Dessert').
+            use_minibatch (bool): Use MiniBatchKMeans instead of KMeans, for large datasets (default is False).
         """
         self.conn = conn
         self.n_clusters = n_clusters
+        self.use_minibatch = use_minibatch
+        # Limit the BLAS/OpenMP threads used for clustering to the physical cores to avoid oversubscription
+        self.n_threads = psutil.cpu_count(logical=False) or 1
         # Features used for clustering
-        self.features = ['calories', 'total_fat', 'sugar', 'total_carb', 'protein', 'calcium', 'fiber']
+        self.features = list(self.FEATURES)
         # Mapping KMeans clusters to food categories
         self.category_mapping = {0: 'Side', 1: 'Dessert', 2: 'Main'}
+        # Per-feature mean and standard deviation from the last classification
+        self.feature_mean: Optional[np.ndarray] = None
+        self.feature_std: Optional[np.ndarray] = None
+        # Scaled features and ids of the last classified items, reused for the PCA plot
+        self.scaled_features: Optional[np.ndarray] = None
+        self.item_ids: Optional[np.ndarray] = None
+
+    @staticmethod
+    def standardize(features: np.ndarray, copy: bool = True) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Scale each feature column to zero mean and unit variance (same as sklearn's StandardScaler).
+        Constant columns are left centered but unscaled.
+
+        Args:
+            features (np.ndarray): 2D array of shape (n_items, n_features).
+            copy (bool): If False, scale the features in place instead of allocating a new array (default is True).
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray]: The scaled features, the per-feature mean and
+            the per-feature standard deviation.
+        """
+        # Accumulate the statistics in float64 for accuracy, then scale in the input dtype
+        mean = features.mean(axis=0, keepdims=True, dtype=np.float64).astype(features.dtype)
+        std = features.std(axis=0, keepdims=True, dtype=np.float64).astype(features.dtype)
+        std[std == 0] = 1
+
+        scaled = features.copy() if copy else features
+        scaled -= mean
+        scaled /= std
+        return scaled, mean, std
 
     def classify_items(self) -> pd.DataFrame:
         """
@@ -34,31 +73,33 @@ class Classifier:
         4. Adds the classification back to the DataFrame and returns it.
 
         Returns:
-            pd.DataFrame: The DataFrame with the added 'category' column containing the classification.
+            pd.DataFrame: The DataFrame of item ids and features with the added 'category' column
+            containing the classification.
         """
-        # Fetch the data from the database
-        df = pd.read_sql_query("SELECT * FROM fastfood;", self.conn)
+        # Fetch only the id and the clustering features from the database
+        query = f"SELECT id, {', '.join(self.features)} FROM fastfood;"
+        df = pd.read_sql_query(query, self.conn)
         
-        # Select only the features used for clustering
-        feature_df = df[self.features].copy()
-
-        # Ensure the features are numeric (convert non-numeric data to NaN and drop rows with NaN values)
-        feature_df = feature_df.apply(pd.to_numeric, errors='coerce')
-        feature_df = feature_df.dropna()
-
-        # Normalize the features using StandardScaler
-        scaler = StandardScaler()
-        scaled_features = scaler.fit_transform(feature_df)
+        # Ensure the features are numeric (convert non-numeric data to NaN) and flag the rows without NaN values
+        numeric_df = df[self.features].apply(pd.to_numeric, errors='coerce')
+        valid = numeric_df.notna().all(axis=1)
 
-        # Perform KMeans clustering on the scaled data
-        kmeans = KMeans(n_clusters=self.n_clusters, random_state=0)
-        feature_df['category'] = kmeans.fit_predict(scaled_features)
+        # Normalize the features, on a contiguous float32 array to halve memory traffic
+        features = np.ascontiguousarray(numeric_df.loc[valid].to_numpy(dtype=np.float32))
+        scaled_features, self.feature_mean, self.feature_std = self.standardize(features, copy=False)
 
-        # Map the cluster numbers to the corresponding food categories
-        feature_df['category'] = feature_df['category'].map(self.category_mapping)
+        # Perform KMeans clustering on the scaled data (Elkan's algorithm prunes most distance computations)
+        if self.use_minibatch:
+            kmeans = MiniBatchKMeans(n_clusters=self.n_clusters, batch_size=1024, n_init=3, random_state=0)
+        else:
+            kmeans = KMeans(n_clusters=self.n_clusters, n_init=3, algorithm='elkan', tol=1e-3, random_state=0)
+        with threadpool_limits(limits=self.n_threads):
+            labels = kmeans.fit_predict(scaled_features)
 
-        # Add the 'category' column back into the original DataFrame
-        df = df.loc[feature_df.index]  # Only keep rows with valid numeric data
-        df['category'] = feature_df['category']
+        # Only keep rows with valid numeric data, and map their cluster numbers to the corresponding food categories
+        df = df.loc[valid].copy()
+        df['category'] = pd.Series(labels, index=df.index).map(self.category_mapping)
+        self.scaled_features = scaled_features
+        self.item_ids = df['id'].to_numpy()
 
         return df
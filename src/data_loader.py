@@ -1,15 +1,28 @@
 import pandas as pd
 from sqlite3 import Connection
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
+from typing import Iterator, Optional
 import psutil
+import math
+import os
 import re
 import logging
 
+# Precompiled patterns and translation table shared by the item name cleaning methods
+_UNWANTED_CHARS = str.maketrans('', '', '®*,')
+_WHITESPACE = re.compile(r'\s+')
+_INCH_MARK = re.compile(r'\d"$')
+
 class DataLoader:
     """
     DataLoader class responsible for loading CSV data into the database, performing
     chunked data loading based on system memory, and cleaning item names.
     """
 
+    SQLITE_MAX_VARIABLES = 999
+
     def __init__(self, connection: Connection):
         """Initialize the DataLoader with a database connection."""
         self.connection = connection
@@ -25,15 +38,17 @@ class DataLoader:
         available_memory_gb = available_memory_bytes / (1024 ** 3)  # Convert bytes to GB
         return available_memory_gb
 
-    def calculate_chunk_size(self, csv_file: str, memory_fraction: float = 0.5) -> int:
+    def calculate_chunk_size(self, csv_file: str, memory_fraction: float = 0.5, sample_rows: int = 1000) -> int:
         """
         Calculate the chunk size for reading the CSV based on available RAM.
         By default, we'll use half of the available memory, though this can be adjusted
-        via the memory_fraction argument.
+        via the memory_fraction argument. The size of the CSV is estimated from the file size
+        and a small sample of rows, so the file is never parsed in full.
 
         Args:
             csv_file (str): Path to the CSV file.
             memory_fraction (float): Fraction of available memory to use (default is 0.5).
+            sample_rows (int): Number of rows to sample for the size estimate (default is 1000).
         
         Returns:
             int: The chunk size (number of rows) to use when reading the CSV in chunks.
@@ -41,22 +56,34 @@ class DataLoader:
         # Get available memory in GB
         available_memory_gb = self.get_available_memory()
 
-        # Calculate the size of the CSV file in GB
-        csv_size_bytes = pd.read_csv(csv_file, nrows=1).memory_usage(deep=True).sum() * pd.read_csv(csv_file).shape[0]
+        # Estimate the in-memory size of one row from a sample of the CSV
+        sample = pd.read_csv(csv_file, nrows=sample_rows)
+        sampled_rows = max(len(sample), 1)
+        one_row_memory_usage_bytes = max(sample.memory_usage(deep=True).sum() / sampled_rows, 1)
+
+        # Estimate the number of rows from the file size and the on-disk size of the sampled rows
+        with open(csv_file, 'rb') as f:
+            header_bytes = len(f.readline())
+            sample_bytes = sum(len(line) for line in islice(f, sampled_rows))
+        one_row_disk_bytes = max(sample_bytes / sampled_rows, 1)
+        estimated_rows = math.ceil((os.path.getsize(csv_file) - header_bytes) / one_row_disk_bytes)
+
+        # Calculate the size of the CSV in memory in GB
+        csv_size_bytes = one_row_memory_usage_bytes * estimated_rows
         csv_size_gb = csv_size_bytes / (1024 ** 3)  # Convert bytes to GB
 
         # Determine chunk size based on available memory and the memory fraction
         if csv_size_gb < available_memory_gb:
             logging.info(f"Whole CSV can fit into memory: {csv_size_gb:.2f} GB < {available_memory_gb:.2f} GB available.")
-            chunk_size = pd.read_csv(csv_file).shape[0]  # Load everything at once
+            chunk_size = estimated_rows  # Load everything at once
         else:
             logging.info(f"Not enough memory for full CSV, loading in chunks using {memory_fraction * available_memory_gb:.2f} GB.")
-            chunk_size = int((memory_fraction * available_memory_gb) * (1024 ** 3) /
-                             (pd.read_csv(csv_file, nrows=1).memory_usage(deep=True).sum()))
+            chunk_size = int((memory_fraction * available_memory_gb) * (1024 ** 3) / one_row_memory_usage_bytes)
 
-        return chunk_size
+        return max(chunk_size, 1)
 
-    def clean_item_name(self, item_name: str) -> str:
+    @staticmethod
+    def clean_item_name(item_name: str) -> str:
         """
         Clean the item name by removing unnecessary characters while keeping meaningful ones like 6".
 
@@ -71,18 +98,34 @@ class DataLoader:
             item_name = item_name[1:].strip()
         
         # Remove trailing quotes if they are not part of a number + inches pattern (e.g., 6")
-        if item_name.endswith('"') and not re.search(r'\d+"$', item_name):
+        if item_name.endswith('"') and not _INCH_MARK.search(item_name):
             item_name = item_name[:-1].strip()
 
         # Remove unwanted characters: trademark symbol (®), asterisk (*), and commas
-        item_name = item_name.replace('®', '').replace('*', '').replace(',', '').strip()
+        item_name = item_name.translate(_UNWANTED_CHARS)
 
         # Normalize spaces after character removal
-        item_name = re.sub(r'\s+', ' ', item_name).strip()
+        item_name = _WHITESPACE.sub(' ', item_name).strip()
 
         return item_name
 
-    def drop_nulls(self, df: pd.DataFrame) -> pd.DataFrame:
+    @staticmethod
+    def clean_item_names(items: pd.Series) -> pd.Series:
+        """
+        Clean a whole Series of item names with the same rules as clean_item_name.
+        The rules are applied in a single pass per item: on object dtype, each pandas .str
+        method is itself a Python-level loop, so chaining them costs one pass per rule.
+
+        Args:
+            items (pd.Series): The raw item names to be cleaned.
+
+        Returns:
+            pd.Series: The cleaned item names, with missing values left as they are.
+        """
+        return items.map(DataLoader.clean_item_name, na_action='ignore')
+
+    @staticmethod
+    def drop_nulls(df: pd.DataFrame) -> pd.DataFrame:
         """
         Drop rows with any null values from the DataFrame.
 
@@ -95,6 +138,49 @@ class DataLoader:
         df_cleaned = df.dropna()  # Drop rows with any NaN values
         return df_cleaned
 
+    @staticmethod
+    def clean_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+        """
+        Clean the item names of a chunk and drop its rows with null values.
+        A static method, so it can be sent to worker processes without the database connection.
+
+        Args:
+            chunk (pd.DataFrame): The raw chunk read from the CSV.
+
+        Returns:
+            pd.DataFrame: The cleaned chunk, ready to be inserted.
+        """
+        chunk['item'] = DataLoader.clean_item_names(chunk['item'])
+        return DataLoader.drop_nulls(chunk)
+
+    def _clean_chunks(self, chunks: Iterator[pd.DataFrame], max_workers: int) -> Iterator[pd.DataFrame]:
+        """
+        Clean chunks in a pool of worker processes, so the next chunks are cleaned while the
+        current one is being inserted. At most max_workers chunks are read ahead, to keep memory bounded.
+
+        Args:
+            chunks (Iterator[pd.DataFrame]): The raw chunks read from the CSV.
+            max_workers (int): Number of worker processes.
+
+        Yields:
+            pd.DataFrame: The cleaned chunks, in their original order.
+        """
+        first_chunks = list(islice(chunks, 2))
+        if max_workers == 1 or len(first_chunks) < 2:
+            # Nothing to overlap with the inserts, so clean in this process
+            yield from map(self.clean_chunk, chain(first_chunks, chunks))
+            return
+
+        chunks = chain(first_chunks, chunks)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            pending = deque(executor.submit(self.clean_chunk, chunk) for chunk in islice(chunks, max_workers))
+            while pending:
+                cleaned = pending.popleft().result()
+                next_chunk = next(chunks, None)
+                if next_chunk is not None:
+                    pending.append(executor.submit(self.clean_chunk, next_chunk))
+                yield cleaned
+
     def _insert_chunk(self, chunk: pd.DataFrame) -> None:
         """
         Insert a chunk of data into the SQLite fastfood table.
@@ -103,29 +189,35 @@ class DataLoader:
             chunk (pd.DataFrame): The chunk of data to be inserted.
         """
         try:
-            chunk.to_sql('fastfood', self.connection, if_exists='append', index=False)
+            # Multi-row INSERTs, sized to stay under SQLite's default limit of 999 bound variables
+            rows_per_insert = max(self.SQLITE_MAX_VARIABLES // len(chunk.columns), 1)
+            chunk.to_sql('fastfood', self.connection, if_exists='append', index=False,
+                         method='multi', chunksize=rows_per_insert)
         except Exception as e:
             logging.error(f"Error inserting chunk into database: {e}")
             raise
 
-    def load_csv_to_db(self, csv_file: str, memory_fraction: float = 0.5) -> None:
+    def load_csv_to_db(self, csv_file: str, memory_fraction: float = 0.5, max_workers: Optional[int] = None) -> None:
         """
         Load the CSV data into the fastfood table using chunked reading based on available memory.
+        Chunks are cleaned in parallel worker processes while the previous ones are inserted.
 
         Args:
             csv_file (str): Path to the CSV file to be loaded.
             memory_fraction (float): Fraction of available memory to use for chunking (default is 0.5).
+            max_workers (Optional[int]): Number of worker processes cleaning chunks (default is the CPU count).
+                Use 1 to clean in the calling process.
         """
         try:
-            # Calculate the appropriate chunk size based on memory
-            chunk_size = self.calculate_chunk_size(csv_file, memory_fraction)
+            max_workers = max_workers or os.cpu_count() or 1
+
+            # Calculate the appropriate chunk size based on memory, shared by every chunk in flight
+            chunk_size = self.calculate_chunk_size(csv_file, memory_fraction / (max_workers + 1))
             logging.info(f"Loading data in chunks of {chunk_size} rows.")
             
-            # Read and process the CSV in chunks
-            for chunk in pd.read_csv(csv_file, chunksize=chunk_size):
-                # Clean item names and drop rows with null values
-                chunk['item'] = chunk['item'].apply(self.clean_item_name)
-                chunk_cleaned = self.drop_nulls(chunk)
+            # Read, clean and insert the CSV in chunks
+            chunks = pd.read_csv(csv_file, chunksize=chunk_size)
+            for chunk_cleaned in self._clean_chunks(chunks, max_workers):
                 self._insert_chunk(chunk_cleaned)
             
             logging.info(f"Data from {csv_file} inserted successfully in chunks.")
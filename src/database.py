@@ -16,6 +16,26 @@ class Database:
     classification, and exporting data.
     """
 
+    PRAGMAS = (
+        "journal_mode=WAL",
+        "synchronous=NORMAL",
+        "temp_store=MEMORY",
+        "cache_size=-262144",  # 256 MB page cache (negative values are in KiB)
+        "mmap_size=268435456",  # 256 MB memory-mapped I/O
+    )
+
+    NUTRITION_STATS_QUERY = """
+        SELECT 
+            restaurant,
+            AVG(calories) AS avg_calories,
+            MIN(calories) AS min_calories,
+            MAX(calories) AS max_calories,
+            AVG(total_carb) AS avg_carbohydrates
+        FROM fastfood
+        GROUP BY restaurant
+        ORDER BY avg_carbohydrates DESC;
+        """
+
     def __init__(self, db_file: str):
         """Initialize the Database class with the SQLite database file."""
         self.db_file = db_file
@@ -37,19 +57,36 @@ class Database:
             # Set the database path inside the 'data/' directory
             db_path = os.path.join('data', self.db_file)
 
-            # If the database file exists, remove it to create a new one
+            # If the database file exists, remove it (and any leftover WAL files) to create a new one
             if os.path.exists(db_path):
                 os.remove(db_path)
                 logging.info(f"Existing database {db_path} deleted.")
+            self._remove_wal_files(db_path)
 
             # Create a new connection
             self.conn = sqlite3.connect(db_path)
+
+            # Tune SQLite for bulk writes: with WAL and synchronous=NORMAL commits no longer fsync
+            for pragma in self.PRAGMAS:
+                self.conn.execute(f"PRAGMA {pragma};")
             logging.info(f"SQLite DB connected: {db_path}")
             return self.conn
         except sqlite3.Error as e:
             logging.error(f"Error connecting to database: {e}")
             raise
 
+    def _remove_wal_files(self, db_path: str) -> None:
+        """
+        Remove the write-ahead log and shared-memory files left next to a database file,
+        so that a stale WAL is never replayed into a freshly created database.
+
+        Args:
+            db_path (str): Path to the SQLite database file.
+        """
+        for suffix in ('-wal', '-shm'):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
+
     def create_table(self) -> None:
         """
         Create a table for fast food nutrition data if it doesn't exist.
@@ -99,6 +136,7 @@ class Database:
         try:
             if os.path.exists(db_path):
                 os.remove(db_path)
+                self._remove_wal_files(db_path)
                 logging.info(f"Database {db_path} deleted successfully.")
             else:
                 logging.warning(f"Database {db_path} does not exist.")
@@ -114,20 +152,16 @@ class Database:
         Args:
             translator (TranslatorModule): The translation module to translate item names.
         """
-        # Calculate the chunk size based on available memory
-        chunk_size = translator.calculate_chunk_size()
-        logging.info(f"Processing translations in chunks of size {chunk_size}...")
-
-        # Fetch data from the SQLite database in chunks and translate
-        for chunk in pd.read_sql_query("SELECT * FROM fastfood;", self.conn, chunksize=chunk_size):
-            chunk['item_gr'] = chunk['item'].apply(translator.translate_item)
+        # Stream the data from the SQLite database in memory-sized chunks and translate
+        for chunk in translator.iter_chunks("SELECT id, item FROM fastfood;"):
+            chunk['item_gr'] = translator.translate_series(chunk['item'])
 
-            # Update the translated items back to the database
-            for index, row in chunk.iterrows():
-                self.conn.execute("UPDATE fastfood SET item_gr = ? WHERE id = ?", (row['item_gr'], row['id']))
-
-            # Commit changes after processing each chunk
-            self.conn.commit()
+            # Update the translated items back to the database in a single transaction per chunk
+            with self.conn:
+                self.conn.executemany(
+                    "UPDATE fastfood SET item_gr = ? WHERE id = ?",
+                    zip(chunk['item_gr'].tolist(), chunk['id'].tolist())
+                )
 
         logging.info("Translations added successfully to the 'item_gr' column.")
 
@@ -141,53 +175,50 @@ class Database:
         # Fetch the classified dataframe from the classifier
         classified_df = classifier.classify_items()
 
-        # Add the 'category' column back into the fastfood table
-        for index, row in classified_df.iterrows():
-            self.conn.execute("UPDATE fastfood SET category = ? WHERE id = ?", (row['category'], row['id']))
-        
-        self.conn.commit()
+        # Add the 'category' column back into the fastfood table in a single transaction
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE fastfood SET category = ? WHERE id = ?",
+                zip(classified_df['category'].tolist(), classified_df['id'].tolist())
+            )
+
         logging.info("Classification added successfully to the 'category' column.")
 
-    def export_classification_to_csv(self, csv_filename: str = "data/food_categories.csv") -> None:
+    def export_classification_to_csv(self, csv_filename: str = "data/food_categories.csv", chunk_size: int = 50000) -> None:
         """
         Export the item names and their corresponding classifications to a CSV file.
+        The rows are streamed in chunks, so only one chunk is held in memory at a time.
         
         Args:
             csv_filename (str): Path to the CSV file where the classification is exported.
+            chunk_size (int): Number of rows fetched and written at a time (default is 50000).
         """
         # Check if the file exists and delete it
         if os.path.exists(csv_filename):
             os.remove(csv_filename)
             logging.info(f"Existing file {csv_filename} has been deleted.")
         
-        # Fetch data
+        # Fetch data in chunks and append each one to the CSV, writing the header only once
         query = "SELECT item, item_gr, category FROM fastfood;"
-        df = pd.read_sql_query(query, self.conn)
+        with open(csv_filename, 'w', newline='', encoding='utf-8') as csv_file:
+            for i, chunk in enumerate(pd.read_sql_query(query, self.conn, chunksize=chunk_size)):
+                chunk.to_csv(csv_file, header=(i == 0), index=False)
 
-        # Save to CSV
-        df.to_csv(csv_filename, index=False)
         logging.info(f"Classification results successfully exported to {csv_filename}.")
 
     def get_nutrition_stats(self) -> pd.DataFrame:
         """
         Retrieve average, minimum, and maximum calorie counts, and rank restaurants by average carbohydrates.
+        The stats are computed from a covering index, created on first use.
         
         Returns:
             pd.DataFrame: DataFrame with nutrition statistics grouped by restaurant.
         """
-        query = """
-        SELECT 
-            restaurant,
-            AVG(calories) AS avg_calories,
-            MIN(calories) AS min_calories,
-            MAX(calories) AS max_calories,
-            AVG(total_carb) AS avg_carbohydrates
-        FROM fastfood
-        GROUP BY restaurant
-        ORDER BY avg_carbohydrates DESC;
-        """
         try:
-            return pd.read_sql_query(query, self.conn)
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_rest_cal ON fastfood(restaurant, calories, total_carb);"
+            )
+            return pd.read_sql_query(self.NUTRITION_STATS_QUERY, self.conn)
         except sqlite3.Error as e:
             logging.error(f"Error querying nutrition stats: {e}")
             raise
@@ -1,11 +1,13 @@
+import numpy as np
 import pandas as pd
 import plotly.express as px
 from sklearn.decomposition import PCA
-from sklearn.preprocessing import StandardScaler
 from dash.dash_table import DataTable  # Updated import to avoid deprecation warning
 from dash.dash_table import Format  # Only if you're using any formatting helpers
 from plotly.graph_objs import Figure
 from sqlite3 import Connection
+from classifier import Classifier
+from typing import Optional
 
 
 class FigureMaker:
@@ -14,10 +16,57 @@ class FigureMaker:
     using data from the fastfood database.
     """
 
-    def __init__(self, conn: Connection) -> None:
-        """Initialize the FigureMaker with a database connection."""
+    def __init__(self, conn: Connection, classifier: Optional[Classifier] = None) -> None:
+        """
+        Initialize the FigureMaker with a database connection.
+
+        Args:
+            conn (Connection): Database connection.
+            classifier (Optional[Classifier]): The classifier that categorized the items, whose scaled
+                features are reused for the PCA plot instead of being read and scaled again.
+        """
         self.conn: Connection = conn
+        self.classifier: Optional[Classifier] = classifier
         self.top_5_restaurants: list[str] = ['Subway', 'Mcdonalds', 'Sonic', 'Taco Bell', 'Arbys']
+        self._top_5_df: Optional[pd.DataFrame] = None
+
+    def _get_top_5_restaurants_df(self) -> pd.DataFrame:
+        """
+        Fetch the items of the top 5 restaurants once and cache them, so that every figure
+        built on these restaurants is derived in memory instead of re-querying the database.
+
+        Returns:
+            pd.DataFrame: One row per item of the top 5 restaurants, in table order.
+        """
+        if self._top_5_df is None:
+            placeholders = ','.join(['?'] * len(self.top_5_restaurants))
+            query = f"""
+            SELECT restaurant, item, item_gr, calories, total_carb
+            FROM fastfood
+            WHERE restaurant IN ({placeholders})
+            ORDER BY id;
+            """
+            self._top_5_df = pd.read_sql_query(query, self.conn, params=self.top_5_restaurants)
+        return self._top_5_df
+
+    def _get_top_calorie_items_df(self, n: int = 5) -> pd.DataFrame:
+        """
+        Get the n highest calorie items per restaurant, using each item's max calories.
+
+        Args:
+            n (int): Number of items to keep per restaurant (default is 5).
+
+        Returns:
+            pd.DataFrame: DataFrame with restaurant, item, item_gr and max_calories columns,
+            sorted by restaurant and descending max_calories.
+        """
+        df = self._get_top_5_restaurants_df()
+
+        # Keep the max calorie row of every item, then the n highest calorie items per restaurant
+        df = df.loc[df.groupby(['restaurant', 'item'])['calories'].idxmax()]
+        df = df.rename(columns={'calories': 'max_calories'})
+        df = df.sort_values(['restaurant', 'max_calories'], ascending=[True, False], kind='stable')
+        return df.groupby('restaurant').head(n)[['restaurant', 'item', 'item_gr', 'max_calories']].reset_index(drop=True)
 
     def get_max_calorie_items_fig(self) -> Figure:
         """
@@ -26,14 +75,14 @@ class FigureMaker:
         Returns:
             plotly.graph_objs._figure.Figure: The scatter plot figure.
         """
-        query = f"""
-        SELECT restaurant, item, item_gr, MAX(calories) as max_calories, AVG(total_carb) as avg_carbohydrates
-        FROM fastfood
-        WHERE restaurant IN ({','.join([f"'{r}'" for r in self.top_5_restaurants])})
-        GROUP BY restaurant
-        ORDER BY max_calories DESC;
-        """
-        df = pd.read_sql_query(query, self.conn)
+        top_5_df = self._get_top_5_restaurants_df()
+        grouped = top_5_df.groupby('restaurant')
+
+        # Max calorie item of every restaurant, along with the restaurant's average carbohydrates
+        df = top_5_df.loc[grouped['calories'].idxmax(), ['restaurant', 'item', 'item_gr', 'calories']]
+        df = df.rename(columns={'calories': 'max_calories'})
+        df['avg_carbohydrates'] = df['restaurant'].map(grouped['total_carb'].mean())
+        df = df.sort_values('max_calories', ascending=False, kind='stable').reset_index(drop=True)
         df['label'] = df['item'] + '<br>' + df['item_gr']
 
         fig = px.scatter(df, x='restaurant', y='max_calories', size='max_calories',
@@ -51,14 +100,10 @@ class FigureMaker:
         Returns:
             plotly.graph_objs._figure.Figure: The donut chart figure.
         """
-        query = f"""
-        SELECT restaurant, AVG(total_carb) as avg_carbohydrates
-        FROM fastfood
-        WHERE restaurant IN ({','.join([f"'{r}'" for r in self.top_5_restaurants])})
-        GROUP BY restaurant
-        ORDER BY avg_carbohydrates DESC;
-        """
-        df = pd.read_sql_query(query, self.conn)
+        df = (self._get_top_5_restaurants_df()
+              .groupby('restaurant', as_index=False)['total_carb'].mean()
+              .rename(columns={'total_carb': 'avg_carbohydrates'})
+              .sort_values('avg_carbohydrates', ascending=False, kind='stable'))
 
         fig = px.pie(df, values='avg_carbohydrates', names='restaurant', hole=0.4)
         
@@ -74,17 +119,7 @@ class FigureMaker:
         Returns:
             plotly.graph_objs._figure.Figure: The treemap figure.
         """
-        query = f"""
-        SELECT restaurant, item, item_gr, max_calories FROM (
-            SELECT restaurant, item, item_gr, MAX(calories) as max_calories,
-                ROW_NUMBER() OVER (PARTITION BY restaurant ORDER BY MAX(calories) DESC) as rank
-            FROM fastfood
-            WHERE restaurant IN ({','.join([f"'{r}'" for r in self.top_5_restaurants])})
-            GROUP BY restaurant, item
-        ) WHERE rank <= 5
-        ORDER BY restaurant, max_calories DESC;
-        """
-        df = pd.read_sql_query(query, self.conn)
+        df = self._get_top_calorie_items_df()
         df['label'] = df['item'] + '<br>' + df['item_gr'] + '<br>' + 'Calories: ' + df['max_calories'].astype(str)
 
         fig = px.treemap(df, path=['restaurant', 'label'], values='max_calories',
@@ -103,17 +138,7 @@ class FigureMaker:
         Returns:
             plotly.graph_objs._figure.Figure: The sunburst plot figure.
         """
-        query = f"""
-        SELECT restaurant, item, item_gr, max_calories FROM (
-            SELECT restaurant, item, item_gr, MAX(calories) as max_calories,
-                ROW_NUMBER() OVER (PARTITION BY restaurant ORDER BY MAX(calories) DESC) as rank
-            FROM fastfood
-            WHERE restaurant IN ({','.join([f"'{r}'" for r in self.top_5_restaurants])})
-            GROUP BY restaurant, item
-        ) WHERE rank <= 5
-        ORDER BY restaurant, max_calories DESC;
-        """
-        df = pd.read_sql_query(query, self.conn)
+        df = self._get_top_calorie_items_df()
         df['label'] = df['item'] + '<br>' + df['item_gr']
 
         fig = px.sunburst(df, path=['restaurant', 'label'], values='max_calories', height=1200, width=1200)
@@ -131,19 +156,24 @@ class FigureMaker:
         Returns:
             plotly.graph_objs._figure.Figure: The PCA scatter plot.
         """
-        query = "SELECT item, item_gr, calories, total_fat, sugar, total_carb, protein, calcium, fiber, category FROM fastfood;"
-        df = pd.read_sql_query(query, self.conn)
-
-        # Normalize the features before PCA
-        features = ['calories', 'total_fat', 'sugar', 'total_carb', 'protein', 'calcium', 'fiber']
-        feature_df = df[features]
+        if self.classifier is not None and self.classifier.scaled_features is not None:
+            # Reuse the features the classifier already scaled, aligned on the classified item ids
+            query = "SELECT id, item, item_gr, category FROM fastfood;"
+            df = pd.read_sql_query(query, self.conn, index_col='id').loc[self.classifier.item_ids].reset_index()
+            scaled_features = self.classifier.scaled_features
+        else:
+            # Read the features directly as float32, so no dtype inference or conversion copy is needed
+            features = self.classifier.features if self.classifier is not None else list(Classifier.FEATURES)
+            query = f"SELECT item, item_gr, {', '.join(features)}, category FROM fastfood;"
+            df = pd.read_sql_query(query, self.conn, dtype={feature: 'float32' for feature in features})
+
+            # Normalize the features before PCA
+            feature_array = np.ascontiguousarray(df[features].to_numpy(dtype=np.float32, na_value=np.nan))
+            scaled_features, _, _ = Classifier.standardize(feature_array, copy=False)
         category_df = df['category']
 
-        scaler = StandardScaler()
-        scaled_features = scaler.fit_transform(feature_df)
-
         # Perform PCA
-        pca = PCA(n_components=2)
+        pca = PCA(n_components=2, svd_solver='randomized', random_state=0)
         pca_result = pca.fit_transform(scaled_features)
         vis_df = pd.DataFrame(pca_result, columns=['PC1', 'PC2'])
         vis_df['category'] = category_df
@@ -167,13 +197,14 @@ class FigureMaker:
 
     def get_food_categories_table(self) -> DataTable:
         """
-        Generates a sortable and scrollable DataTable for the food categories CSV.
+        Generates a sortable and scrollable DataTable of the food categories, the same data
+        as the exported food_categories.csv, read from the database instead of re-parsing the CSV.
 
         Returns:
             DataTable: The table showing food categories.
         """
-        # Load the food_categories.csv into a pandas DataFrame
-        df = pd.read_csv('data/food_categories.csv')
+        # Load the item names and their categories into a pandas DataFrame
+        df = pd.read_sql_query("SELECT item, item_gr, category FROM fastfood;", self.conn)
 
         # Create a Dash DataTable from the DataFrame
         table = DataTable(
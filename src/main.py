@@ -6,6 +6,7 @@ from classifier import Classifier
 import dash
 from dash import dcc, html
 import logging
+import os
 
 def main():
     """
@@ -35,8 +36,14 @@ def main():
     
     # Translate item names into Greek
     logging.info("Translating food item names into Greek...")
-    translator = TranslatorModule(connection=conn, translation_csv="data/curated_translations.csv")
-    db.populate_item_gr_column(translator=translator)
+    # Translate with the Google Cloud Translation API if a Cloud project is configured, googletrans otherwise
+    translator = TranslatorModule(connection=conn, translation_csv="data/curated_translations.csv",
+                                  cloud_project=os.environ.get("GOOGLE_CLOUD_PROJECT"))
+    try:
+        db.populate_item_gr_column(translator=translator)
+    finally:
+        # Release the translation threads and HTTP clients even if the translation fails
+        translator.close()
     logging.info("Translation completed successfully.")
 
     # Initialize the classifier and classify items
@@ -48,7 +55,7 @@ def main():
 
     # Create the figures using FigureMaker
     logging.info("Generating visualizations...")
-    figure_maker = FigureMaker(conn=conn)
+    figure_maker = FigureMaker(conn=conn, classifier=classifier)
     max_calorie_fig = figure_maker.get_max_calorie_items_fig()
     avg_carbohydrates_fig = figure_maker.get_avg_carbohydrates_donut_fig()
     calorie_treemap_fig = figure_maker.get_calorie_treemap_fig()
@@ -2,12 +2,32 @@
    - Fetching data from the SQLite database in chunks.
    - Checking available RAM to handle large datasets efficiently.
    - Translating food item names, using a curated dictionary first and Google Translate as a fallback.
+     Google Cloud Translation (v3) is used when a Cloud project is configured, googletrans otherwise.
 """
 
-import pandas as pd
+from __future__ import annotations
+
+import csv
+import hashlib
 import psutil
-from googletrans import Translator
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+import logging
+import os
+import pickle
 import sqlite3
+import sys
+import tempfile
+import time
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Optional, TypeVar
+
+# pandas and googletrans are slow to import, so they are only imported when first needed;
+# these imports only serve the type annotations
+if TYPE_CHECKING:
+    import pandas as pd
+    from googletrans import Translator
+
+T = TypeVar('T')
 
 class TranslatorModule:
     """
@@ -15,7 +35,14 @@ class TranslatorModule:
     It first checks a curated CSV dictionary for translations and falls back to Google Translate if not found.
     """
 
-    def __init__(self, connection: sqlite3.Connection, translation_csv: str, memory_fraction: float = 0.5):
+    # Version of the pickled translation dictionary format, to be bumped whenever its contents change shape
+    DICT_CACHE_VERSION = 4
+    # Maximum number of strings, and total codepoints, accepted by a single Cloud Translation translate_text request
+    CLOUD_BATCH_SIZE = 1024
+    CLOUD_BATCH_CODEPOINTS = 30000
+
+    def __init__(self, connection: sqlite3.Connection, translation_csv: str, memory_fraction: float = 0.5,
+                 max_workers: int = 8, max_retries: int = 3, cloud_project: Optional[str] = None):
         """
         Initialize the TranslatorModule with a SQLite connection and load the translation dictionary.
         
@@ -23,36 +50,208 @@ class TranslatorModule:
             connection (sqlite3.Connection): Database connection.
             translation_csv (str): Path to the curated translation CSV file.
             memory_fraction (float): Fraction of available memory to allocate for chunk processing.
+            max_workers (int): Number of Google Translate requests sent concurrently (default is 8).
+            max_retries (int): Number of attempts for each Google Translate request (default is 3).
+            cloud_project (Optional[str]): Google Cloud project to translate with the Cloud Translation API,
+                which translates batches of up to CLOUD_BATCH_SIZE texts and CLOUD_BATCH_CODEPOINTS codepoints
+                per request. If None (default), or if the google-cloud-translate client is unavailable,
+                googletrans is used instead.
         """
         self.conn = connection
         self.memory_fraction = memory_fraction
-        self.translator = Translator()
+        self.max_retries = max_retries
+        self.cloud_project = cloud_project
+        self.cloud_client: Optional[Any] = self._create_cloud_client() if cloud_project else None
+        # Estimated memory usage of one fastfood row, computed on first use
+        self._row_bytes: Optional[int] = None
+        # Last available memory reading (in bytes) and its time.monotonic() timestamp
+        self._mem_cache_ts: Optional[float] = None
+        self._mem_cache_val: Optional[int] = None
+        # Memoized Google Translate results, keyed on (text, target language)
+        self._trans_cache: dict[tuple[str, str], str] = {}
+        # Google Translate requests are network-bound, so they are sent from a pool of threads
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
         
         # Load the curated translations from the CSV
         self.dict_translations = self.load_translation_dict(translation_csv)
 
+    @staticmethod
+    def normalize_key(item: str) -> str:
+        """
+        Normalize a food item name into the canonical form used as translation dictionary key,
+        so that spacing and capitalization variants of the same name share one entry.
+
+        Args:
+            item (str): Food item name.
+
+        Returns:
+            str: The normalized item name.
+        """
+        return item.strip().lower()
+
+    @cached_property
+    def translator(self) -> Translator:
+        """
+        The googletrans client, created on first use so that runs resolved entirely by the curated
+        dictionary (or by Cloud Translation) never import googletrans. cached_property isn't thread-safe,
+        so it is first accessed in the calling thread, before the requests fan out to the thread pool.
+
+        Returns:
+            Translator: The googletrans client.
+        """
+        import httpx
+        from googletrans import Translator
+
+        # googletrans sends every request through this one httpx client, so the threads share its
+        # keep-alive connections, and with HTTP/2 multiplex their requests over them
+        return Translator(http2=True, timeout=httpx.Timeout(10.0))
+
+    def _create_cloud_client(self) -> Optional[Any]:
+        """
+        Create the Google Cloud Translation client. The client library is an optional dependency,
+        so it is only imported here, when a Cloud project is configured.
+
+        Returns:
+            Optional[TranslationServiceClient]: The client, or None if it can't be created.
+        """
+        try:
+            from google.cloud import translate_v3
+            return translate_v3.TranslationServiceClient()
+        except Exception as e:
+            logging.warning(f"Google Cloud Translation unavailable, falling back to googletrans: {e}")
+            return None
+
     def load_translation_dict(self, csv_path: str) -> dict:
         """
-        Load translations from the given CSV file into a dictionary.
+        Load translations from the given CSV file into a dictionary, keyed on the normalized item names.
+        The parsed dictionary is cached in a pickle file next to the CSV, along with a hash of the CSV's
+        contents. Later runs load the pickle instead of parsing the CSV as long as the hash still matches,
+        so an edited or replaced CSV is always parsed again, whatever its modification time.
+
+        Args:
+            csv_path (str): Path to the translation CSV file.
+
+        Returns:
+            dict: Dictionary with normalized item names as keys and their Greek translations as values.
+        """
+        cache_path = csv_path + '.pkl'
+        # Hashing the CSV is much cheaper than parsing it, and unlike its mtime it can't go stale
+        with open(csv_path, 'rb') as f:
+            csv_digest = hashlib.file_digest(f, 'blake2b').hexdigest()
+
+        if os.path.exists(cache_path):
+            try:
+                with open(cache_path, 'rb') as f:
+                    cache = pickle.load(f)
+                if cache[0] == self.DICT_CACHE_VERSION and cache[1] == csv_digest:
+                    return cache[2]
+            except Exception as e:
+                logging.warning(f"Ignoring unreadable translation cache {cache_path}: {e}")
+
+        translations = self._parse_translation_csv(csv_path)
+
+        # Write the cache atomically, so a concurrent or interrupted run never sees a partial file
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path) or '.', suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump((self.DICT_CACHE_VERSION, csv_digest, translations), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+            tmp_path = None
+        except (OSError, pickle.PickleError) as e:
+            logging.warning(f"Could not write translation cache {cache_path}: {e}")
+        finally:
+            # Don't leave the temporary file behind if the cache couldn't be written
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        return translations
+
+    def _parse_translation_csv(self, csv_path: str) -> dict:
+        """
+        Parse the translation CSV file into a dictionary, normalizing the item names once here
+        so that lookups only need to normalize their input. Keys and translations are interned,
+        so a translation repeated across many items is stored once (pickling the dictionary
+        preserves this sharing).
 
         Args:
             csv_path (str): Path to the translation CSV file.
 
         Returns:
-            dict: Dictionary with item names as keys and their Greek translations as values.
+            dict: Dictionary with normalized item names as keys and their Greek translations as values.
         """
-        df = pd.read_csv(csv_path)
-        return pd.Series(df['item_gr'].values, index=df['item']).to_dict()
+        with open(csv_path, newline='', encoding='utf-8-sig') as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            item_index, item_gr_index = header.index('item'), header.index('item_gr')
+            translations = {}
+            for row in reader:
+                if not row:
+                    continue
+                key, translated = sys.intern(self.normalize_key(row[item_index])), sys.intern(row[item_gr_index])
+                # Entries differing only in case or spacing share a key, and the last one wins
+                if translations.get(key, translated) != translated:
+                    logging.warning(f"Translation of '{row[item_index]}' in {csv_path} overrides "
+                                    f"'{translations[key]}' with '{translated}'")
+                translations[key] = translated
+            return translations
 
-    def get_available_memory(self) -> float:
+    def get_available_memory_bytes(self, ttl: float = 1.0) -> int:
+        """
+        Check and return the available system memory in bytes.
+        The reading is cached for ttl seconds, since it barely changes between successive calls.
+
+        Args:
+            ttl (float): Number of seconds a reading is reused for (default is 1.0).
+
+        Returns:
+            int: Available system memory in bytes.
+        """
+        now = time.monotonic()
+        if self._mem_cache_ts is None or now - self._mem_cache_ts >= ttl:
+            self._mem_cache_val = psutil.virtual_memory().available
+            self._mem_cache_ts = now
+        return self._mem_cache_val
+
+    def get_available_memory(self, ttl: float = 1.0) -> float:
         """
         Check and return the available system memory in GB.
 
+        Args:
+            ttl (float): Number of seconds a reading is reused for (default is 1.0).
+
         Returns:
             float: Available system memory in GB.
         """
-        available_memory_bytes = psutil.virtual_memory().available
-        return available_memory_bytes / (1024 ** 3)  # Convert bytes to GB
+        return self.get_available_memory_bytes(ttl) / (1024 ** 3)  # Convert bytes to GB
+
+    def estimate_row_bytes(self, sample_rows: int = 1000) -> int:
+        """
+        Estimate the memory usage of one fastfood row from the table schema, without loading any rows.
+        Numeric columns take 8 bytes. Text columns take a Python string object plus their average length,
+        measured by SQLite over a sample of rows.
+
+        Args:
+            sample_rows (int): Number of rows used to measure the average text lengths (default is 1000).
+
+        Returns:
+            int: Estimated memory usage of one row in bytes.
+        """
+        columns = self.conn.execute("PRAGMA table_info(fastfood);").fetchall()
+        text_columns = [name for _, name, col_type, *_ in columns if col_type.upper() == 'TEXT']
+        row_bytes = 8 * (len(columns) - len(text_columns))
+
+        if text_columns:
+            # Average text lengths of all text columns in a single query
+            averages = ', '.join(f'AVG(LENGTH("{name}"))' for name in text_columns)
+            names = ', '.join(f'"{name}"' for name in text_columns)
+            avg_lengths = self.conn.execute(
+                f"SELECT {averages} FROM (SELECT {names} FROM fastfood LIMIT ?);", (sample_rows,)
+            ).fetchone()
+            string_overhead = 8 + sys.getsizeof('')  # Object pointer plus an empty string's size
+            row_bytes += sum(string_overhead + (avg_length or 0) for avg_length in avg_lengths)
+
+        return max(int(row_bytes), 1)
 
     def calculate_chunk_size(self) -> int:
         """
@@ -61,17 +260,153 @@ class TranslatorModule:
         Returns:
             int: Number of rows to process in a single chunk.
         """
-        available_memory_gb = self.get_available_memory()
         # Use half of the available memory by default (adjustable via memory_fraction)
-        allocated_memory_gb = self.memory_fraction * available_memory_gb
+        allocated_bytes = int(self.memory_fraction * self.get_available_memory_bytes())
         
-        # Estimate the memory usage of one row of data
-        one_row_memory_usage_bytes = pd.read_sql_query("SELECT * FROM fastfood LIMIT 1;", self.conn).memory_usage(deep=True).sum()
-        one_row_memory_usage_gb = one_row_memory_usage_bytes / (1024 ** 3)  # Convert bytes to GB
+        # Estimate the memory usage of one row of data, once: the schema doesn't change over the connection's lifetime
+        if self._row_bytes is None:
+            self._row_bytes = self.estimate_row_bytes()
         
-        # Calculate chunk size based on available memory and estimated memory usage per row
-        chunk_size = int(allocated_memory_gb / one_row_memory_usage_gb)
-        return max(chunk_size, 1)  # Ensure chunk_size is at least 1
+        # Calculate chunk size based on available memory and estimated memory usage per row, in whole bytes
+        return max(allocated_bytes // self._row_bytes, 1)  # Ensure chunk_size is at least 1
+
+    def close(self) -> None:
+        """Shut down the thread pool used for Google Translate requests, and close the clients it created."""
+        self._pool.shutdown()
+        # The googletrans client is only created on first use
+        if 'translator' in self.__dict__:
+            self.translator.client.close()
+        if self.cloud_client is not None:
+            self.cloud_client.transport.close()
+
+    def _with_retry(self, request: Callable[[], T], description: str) -> T:
+        """
+        Send a translation request, retrying with exponential backoff on failure.
+
+        Args:
+            request (Callable[[], T]): Function sending the request and returning its result.
+            description (str): Description of what is translated, for the log messages.
+
+        Returns:
+            T: The result of the request.
+        """
+        for attempt in range(self.max_retries):
+            try:
+                return request()
+            except Exception as e:
+                if attempt == self.max_retries - 1:
+                    logging.error(f"Error translating {description}: {e}")
+                    raise
+                logging.warning(f"Retrying translation of {description} after error: {e}")
+                time.sleep(0.5 * 2 ** attempt)
+
+    def _translate_with_retry(self, translator: Translator, text: str, target_language: str) -> str:
+        """
+        Translate a single text using googletrans, retrying with exponential backoff on failure.
+
+        Args:
+            translator (Translator): The googletrans client, shared by all the threads.
+            text (str): Text to translate.
+            target_language (str): Target language for translation.
+
+        Returns:
+            str: Translated text.
+        """
+        return self._with_retry(lambda: translator.translate(text, dest=target_language).text, f"'{text}'")
+
+    def _cloud_batches(self, texts: list[str]) -> list[list[str]]:
+        """
+        Split texts into consecutive batches that fit in a single Cloud Translation request. A batch is
+        closed as soon as the next text would exceed either CLOUD_BATCH_SIZE texts or CLOUD_BATCH_CODEPOINTS
+        codepoints in total.
+
+        Args:
+            texts (list[str]): Texts to translate.
+
+        Returns:
+            list[list[str]]: The batches, in the same order as the input.
+        """
+        batches, batch, batch_codepoints = [], [], 0
+        for text in texts:
+            if batch and (len(batch) == self.CLOUD_BATCH_SIZE
+                          or batch_codepoints + len(text) > self.CLOUD_BATCH_CODEPOINTS):
+                batches.append(batch)
+                batch, batch_codepoints = [], 0
+            batch.append(text)
+            batch_codepoints += len(text)
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def _cloud_translate_batch(self, texts: list[str], target_language: str) -> list[str]:
+        """
+        Translate a batch of texts, as made by _cloud_batches, with a single Cloud Translation request,
+        retrying with exponential backoff on failure.
+
+        Args:
+            texts (list[str]): Texts to translate.
+            target_language (str): Target language for translation.
+
+        Returns:
+            list[str]: Translated texts, in the same order as the input.
+        """
+        request = {
+            'parent': f"projects/{self.cloud_project}/locations/global",
+            'contents': texts,
+            'mime_type': 'text/plain',
+            'source_language_code': 'en',
+            'target_language_code': target_language,
+        }
+        response = self._with_retry(lambda: self.cloud_client.translate_text(request=request),
+                                    f"a batch of {len(texts)} texts")
+        return [translation.translated_text for translation in response.translations]
+
+    def _google_translate(self, texts: list[str], target_language: str) -> list[str]:
+        """
+        Translate texts using Google Translate, caching every result so that a text seen before
+        (e.g. a word shared by many item names) is never requested again.
+
+        Args:
+            texts (list[str]): Texts to translate.
+            target_language (str): Target language for translation.
+
+        Returns:
+            list[str]: Translated texts, in the same order as the input.
+        """
+        # Request each distinct text missing from the cache only once, concurrently
+        misses = [text for text in dict.fromkeys(texts) if (text, target_language) not in self._trans_cache]
+        if self.cloud_client is not None:
+            # Cloud Translation takes whole batches of texts per request
+            batches = self._cloud_batches(misses)
+            batch_translations = self._pool.map(lambda batch: self._cloud_translate_batch(batch, target_language), batches)
+            translations = [translated for batch in batch_translations for translated in batch]
+        elif misses:
+            # Create the googletrans client before fanning out, so that all the threads share one client
+            translator = self.translator
+            translations = self._pool.map(lambda text: self._translate_with_retry(translator, text, target_language), misses)
+        else:
+            translations = []
+        for text, translated in zip(misses, translations):
+            self._trans_cache[(text, target_language)] = translated
+
+        return [self._trans_cache[(text, target_language)] for text in texts]
+
+    def iter_chunks(self, query: str = "SELECT * FROM fastfood;") -> Iterator[pd.DataFrame]:
+        """
+        Stream the results of a query in chunks sized to the available memory.
+        The rows are fetched incrementally from the database cursor, so each row is read only once.
+
+        Args:
+            query (str): The query to run (default selects the whole fastfood table).
+
+        Yields:
+            pd.DataFrame: The next chunk of rows.
+        """
+        import pandas as pd
+
+        chunk_size = self.calculate_chunk_size()
+        logging.info(f"Reading query results in chunks of {chunk_size} rows...")
+        yield from pd.read_sql_query(query, self.conn, chunksize=chunk_size)
 
     def google_translate_word_by_word(self, item: str, target_language: str = 'el') -> str:
         """
@@ -85,15 +420,51 @@ class TranslatorModule:
             str: Translated food item name.
         """
         words = item.split()  # Split the item name into individual words
-        translated_words = [
-            self.translator.translate(word, dest=target_language).text for word in words
-        ]
+        translated_words = self._google_translate(words, target_language)
         return ' '.join(translated_words)  # Reassemble the translated words
 
+    def google_translate_items(self, items: list[str], target_language: str = 'el') -> list[str]:
+        """
+        Translate whole food item names using Google Translate, all of them together, so that they
+        can share requests. Items Google Translate returns untranslated fall back to being
+        translated word by word, with the words of all such items also requested together.
+
+        Args:
+            items (list[str]): Food item names to translate.
+            target_language (str): Target language for translation (default is 'el' for Greek).
+
+        Returns:
+            list[str]: Translated food item names, in the same order as the input.
+        """
+        nonempty = [item for item in items if item.strip()]
+        translations = dict(zip(nonempty, self._google_translate(nonempty, target_language)))
+
+        # Request the words of every untranslated item at once, then reassemble each item from the cache
+        untranslated = [item for item, translated in translations.items() if translated.strip() == item.strip()]
+        self._google_translate([word for item in untranslated for word in item.split()], target_language)
+        for item in untranslated:
+            translations[item] = self.google_translate_word_by_word(item, target_language)
+
+        return [translations.get(item, '') for item in items]
+
+    def google_translate_item(self, item: str, target_language: str = 'el') -> str:
+        """
+        Translate a whole food item name using Google Translate, in a single request.
+        If Google Translate returns it untranslated, fall back to translating it word by word.
+
+        Args:
+            item (str): Food item name to translate.
+            target_language (str): Target language for translation (default is 'el' for Greek).
+
+        Returns:
+            str: Translated food item name.
+        """
+        return self.google_translate_items([item], target_language)[0]
+
     def translate_item(self, item: str) -> str:
         """
         Translate a food item name. First, it checks the curated dictionary for translation.
-        If not found, it falls back to Google Translate.
+        If not found, it falls back to Google Translate. For whole chunks, use translate_series.
 
         Args:
             item (str): The food item name to translate.
@@ -102,8 +473,49 @@ class TranslatorModule:
             str: Translated food item name (Greek by default).
         """
         # Check if the item is in the curated dictionary
-        if item in self.dict_translations:
-            return self.dict_translations[item]
+        translated = self.dict_translations.get(self.normalize_key(item))
+        if translated is not None:
+            return translated
         else:
-            # Fallback to Google Translate word-by-word translation
-            return self.google_translate_word_by_word(item)
+            # Fallback to Google Translate
+            return self.google_translate_item(item)
+
+    def translate_items_bulk(self, items: list[str], target_language: str = 'el') -> list[str]:
+        """
+        Translate a batch of food item names. Items found in the curated dictionary are resolved
+        directly, and the distinct remaining items are sent to Google Translate together, each only once.
+
+        Args:
+            items (list[str]): The food item names to translate.
+            target_language (str): Target language for translation (default is 'el' for Greek).
+
+        Returns:
+            list[str]: Translated food item names, in the same order as the input.
+        """
+        # Look up every item once, and deduplicate the dictionary misses, keeping their first-seen order.
+        # The lookups are bound to locals, so the loop doesn't resolve them on self for every item
+        lookup, normalize_key = self.dict_translations.get, self.normalize_key
+        dict_hits = [lookup(normalize_key(item)) for item in items]
+        misses = dict.fromkeys(item for item, hit in zip(items, dict_hits) if hit is None)
+        google_translations = dict(zip(misses, self.google_translate_items(list(misses), target_language)))
+
+        return [hit if hit is not None else google_translations[item] for item, hit in zip(items, dict_hits)]
+
+    def translate_series(self, items: pd.Series, target_language: str = 'el') -> pd.Series:
+        """
+        Translate a Series of food item names. Curated dictionary hits are resolved for the whole
+        Series at once, and only the remaining items go through translate_items_bulk.
+        This is the path for translating chunks; translate_item is the scalar equivalent.
+
+        Args:
+            items (pd.Series): The food item names to translate.
+            target_language (str): Target language for translation (default is 'el' for Greek).
+
+        Returns:
+            pd.Series: Translated food item names, with the same index as the input.
+        """
+        translated = items.map(self.normalize_key, na_action='ignore').map(self.dict_translations).astype(object)
+        missing = translated.isna()
+        if missing.any():
+            translated[missing] = self.translate_items_bulk(items[missing].tolist(), target_language)
+        return translated
@@ -0,0 +1,27 @@
+import sys
+import os
+import numpy as np
+from sklearn.preprocessing import StandardScaler
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from classifier import Classifier
+
+def test_standardize_matches_standard_scaler():
+    """Test that standardize matches sklearn's StandardScaler in float32, including a constant column."""
+    rng = np.random.default_rng(0)
+    features = rng.uniform(0, 2000, size=(500, 4))
+    features[:, 2] = 250  # Zero variance column, left centered but unscaled
+    expected = StandardScaler().fit_transform(features)
+
+    features32 = features.astype(np.float32)
+    scaled, mean, std = Classifier.standardize(features32)
+    assert scaled.dtype == np.float32
+    np.testing.assert_allclose(scaled, expected, rtol=1e-4, atol=1e-5)
+    np.testing.assert_array_equal(scaled[:, 2], 0)
+    assert std[0, 2] == 1
+
+    # The input is left untouched by default, and scaled in place with copy=False
+    np.testing.assert_array_equal(features32, features.astype(np.float32))
+    in_place, _, _ = Classifier.standardize(features32, copy=False)
+    assert in_place is features32
+    np.testing.assert_array_equal(in_place, scaled)
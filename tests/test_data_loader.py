@@ -1,5 +1,6 @@
 import sys
 import os
+import sqlite3
 import pandas as pd
 import pytest
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
@@ -18,6 +19,12 @@ def test_clean_item_name(data_loader):
     assert data_loader.clean_item_name("6\" Sandwich") == '6" Sandwich'
     assert data_loader.clean_item_name('Spicy Chicken® Sandwich *') == 'Spicy Chicken Sandwich'
 
+def test_clean_item_names(data_loader):
+    """Test that clean_item_names matches clean_item_name on a whole Series."""
+    raw = pd.Series(['Chicken Sandwich®', '"Chicken"', '6" Sandwich', 'Spicy Chicken® Sandwich *', 'Nuggets, 10 pc'])
+    cleaned = data_loader.clean_item_names(raw)
+    assert cleaned.tolist() == [data_loader.clean_item_name(item) for item in raw]
+
 def test_drop_nulls(data_loader):
     """Test the drop_nulls method."""
     df = pd.DataFrame({
@@ -41,3 +48,20 @@ def test_calculate_chunk_size(data_loader, monkeypatch):
 
     # Clean up test CSV file
     os.remove(test_csv_file)
+
+def test_load_csv_to_db_in_parallel(tmp_path, monkeypatch):
+    """Test that chunks cleaned by worker processes are all inserted, in order."""
+    csv_file = tmp_path / 'fastfood.csv'
+    pd.DataFrame({
+        'item': [f'Burger® {i}' for i in range(10)],
+        'calories': [100 * i for i in range(10)]
+    }).to_csv(csv_file, index=False)
+
+    connection = sqlite3.connect(':memory:')
+    loader = DataLoader(connection=connection)
+    monkeypatch.setattr(loader, 'calculate_chunk_size', lambda csv_file, memory_fraction: 3)
+    loader.load_csv_to_db(str(csv_file), max_workers=2)
+
+    df = pd.read_sql_query("SELECT * FROM fastfood;", connection)
+    assert df['item'].tolist() == [f'Burger {i}' for i in range(10)]
+    assert df['calories'].tolist() == [100 * i for i in range(10)]
@@ -0,0 +1,31 @@
+import sys
+import os
+import sqlite3
+import pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from database import Database
+
+@pytest.fixture
+def database():
+    """Fixture to initialize a Database on an in-memory connection, with a few items loaded."""
+    db = Database(db_file=':memory:')
+    db.conn = sqlite3.connect(':memory:')
+    db.create_table()
+    db.conn.executemany(
+        "INSERT INTO fastfood (restaurant, item, calories, total_carb) VALUES (?, ?, ?, ?);",
+        [('Sonic', 'Chili Dog', 1250, 50), ('Sonic', 'Tots', 500, 40), ('Arbys', 'Curly Fries', 600, 80)]
+    )
+    yield db
+    db.conn.close()
+
+def test_get_nutrition_stats(database):
+    """Test that get_nutrition_stats aggregates per restaurant from its covering index."""
+    stats = database.get_nutrition_stats()
+    assert stats.values.tolist() == [
+        ['Arbys', 600.0, 600, 600, 80.0],
+        ['Sonic', 875.0, 500, 1250, 45.0],
+    ]
+
+    plan = database.conn.execute("EXPLAIN QUERY PLAN " + Database.NUTRITION_STATS_QUERY).fetchall()
+    assert any('USING COVERING INDEX idx_rest_cal' in step[-1] for step in plan)
@@ -0,0 +1,105 @@
+import sys
+import os
+import sqlite3
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.decomposition import PCA
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from classifier import Classifier
+from database import Database
+from figuremaker import FigureMaker
+
+def insert_items(conn, rows):
+    """Insert (restaurant, item, calories, total_carb) rows, with item_gr set to the item name in lowercase."""
+    conn.executemany(
+        "INSERT INTO fastfood (restaurant, item, item_gr, calories, total_carb) VALUES (?, ?, ?, ?, ?);",
+        [(restaurant, item, item.lower(), calories, total_carb) for restaurant, item, calories, total_carb in rows]
+    )
+    conn.commit()
+
+@pytest.fixture
+def conn():
+    """Fixture to create the fastfood table in an in-memory database."""
+    db = Database(db_file=':memory:')
+    db.conn = sqlite3.connect(':memory:')
+    db.create_table()
+    yield db.conn
+    db.conn.close()
+
+@pytest.fixture
+def figure_maker(conn):
+    """Fixture to initialize FigureMaker on a few Sonic and Arbys items, and an item of another restaurant."""
+    insert_items(conn, [
+        ('Sonic', 'Zeta Burger', 1120, 60),
+        ('Sonic', 'Big Shake', 1300, 150),
+        ('Sonic', 'Fries', 900, 70),
+        ('Sonic', 'Chili Dog', 1250, 50),
+        ('Sonic', 'Alpha Burger', 1120, 60),
+        ('Sonic', 'Double Burger', 1200, 55),
+        ('Sonic', 'Fries', 1150, 90),
+        ('Sonic', 'Tots', 500, 40),
+        ('Arbys', 'Roast Beef', 800, 40),
+        ('Arbys', 'Brisket', 800, 60),
+        ('Arbys', 'Curly Fries', 600, 80),
+        ('Burger King', 'Whopper', 2000, 50),
+    ])
+    return FigureMaker(conn=conn)
+
+def test_top_calorie_items(figure_maker):
+    """Test the top calorie items per restaurant: one row per item at its max calories, with ties broken by item name."""
+    df = figure_maker._get_top_calorie_items_df()
+    assert df[['restaurant', 'item', 'max_calories']].values.tolist() == [
+        ['Arbys', 'Brisket', 800],
+        ['Arbys', 'Roast Beef', 800],
+        ['Arbys', 'Curly Fries', 600],
+        ['Sonic', 'Big Shake', 1300],
+        ['Sonic', 'Chili Dog', 1250],
+        ['Sonic', 'Double Burger', 1200],
+        ['Sonic', 'Fries', 1150],
+        ['Sonic', 'Alpha Burger', 1120],  # Tied with Zeta Burger for 5th place
+    ]
+
+def test_max_calorie_items(figure_maker):
+    """Test the max calorie item per restaurant, with ties broken by the first item in table order."""
+    scatter = figure_maker.get_max_calorie_items_fig().data[0]
+    assert list(scatter.x) == ['Sonic', 'Arbys']
+    assert list(scatter.y) == [1300, 800]
+    assert list(scatter.hovertext) == ['Big Shake<br>big shake', 'Roast Beef<br>roast beef']
+    assert list(scatter.marker.color) == pytest.approx([575 / 8, 60])  # Average carbohydrates of all the items
+
+def test_pca_clusters_reuse_classifier_features(conn):
+    """Test that the PCA plot reusing the classifier's scaled features keeps every point aligned with its item,
+    when rows with missing or non-numeric features are left out of the classification."""
+    features = list(Classifier.FEATURES)
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.integers(1, 1000, size=(12, len(features))), columns=features)
+    df.insert(0, 'item', [f"Item {i}" for i in range(len(df))])
+    df['item_gr'] = df['item'].str.lower()
+    df = df.astype(object)
+    df.loc[1, 'calories'] = None  # Missing feature
+    df.loc[3, 'protein'] = 'n/a'  # Non-numeric feature
+    df.to_sql('fastfood', conn, if_exists='append', index=False)
+
+    classifier = Classifier(conn=conn)
+    db = Database(db_file=':memory:')
+    db.conn = conn
+    db.classify_items_and_add_category(classifier=classifier)
+    fig = FigureMaker(conn=conn, classifier=classifier).get_pca_clusters_fig()
+
+    # Expected PCA coordinates of the valid items, computed independently in table order
+    valid = df.drop(index=[1, 3])
+    scaled, _, _ = Classifier.standardize(valid[features].to_numpy(dtype=np.float32))
+    expected = PCA(n_components=2, svd_solver='randomized', random_state=0).fit_transform(scaled)
+    expected_points = dict(zip(valid['item'] + ' | ' + valid['item_gr'], expected.tolist()))
+    categories = dict(conn.execute("SELECT item || ' | ' || item_gr, category FROM fastfood;").fetchall())
+
+    points = {}
+    for trace in fig.data:
+        for label, x, y in zip(trace.hovertext, trace.x, trace.y):
+            assert categories[label] == trace.name
+            points[label] = [x, y]
+    assert points.keys() == expected_points.keys()
+    for label, point in points.items():
+        assert point == pytest.approx(expected_points[label], abs=1e-4)
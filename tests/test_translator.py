@@ -0,0 +1,226 @@
+import sys
+import os
+import time
+import pandas as pd
+import pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from translator import TranslatorModule
+
+class FakeResult:
+    """Stand-in for a googletrans translation result."""
+
+    def __init__(self, text):
+        self.text = text
+
+class FakeConnection:
+    """Stand-in for an HTTP client or transport, recording whether it was closed."""
+
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+class FakeTranslator:
+    """Stand-in for googletrans.Translator that records every request instead of calling Google."""
+
+    def __init__(self, untranslated=(), failures=0):
+        self.client = FakeConnection()
+        self.requests = []
+        self.untranslated = set(untranslated)
+        self.failures = failures
+
+    def translate(self, text, dest='en', src='auto'):
+        self.requests.append(text)
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError('Simulated network error')
+        return FakeResult(text if text in self.untranslated else f'{dest}:{text}')
+
+class FakeCloudClient:
+    """Stand-in for the Google Cloud TranslationServiceClient that records every batch it is sent."""
+
+    def __init__(self):
+        self.transport = FakeConnection()
+        self.requests = []
+
+    def translate_text(self, request):
+        self.requests.append(request['contents'])
+        translations = [type('Translation', (), {'translated_text': f"cloud:{text}"})() for text in request['contents']]
+        return type('Response', (), {'translations': translations})()
+
+@pytest.fixture
+def translator(tmp_path):
+    """Fixture to initialize a TranslatorModule with a small curated dictionary and a fake Google Translate."""
+    translation_csv = tmp_path / 'translations.csv'
+    translation_csv.write_text('item,item_gr\nBurger,Μπέργκερ\nFries,Πατάτες\n', encoding='utf-8')
+    module = TranslatorModule(connection=None, translation_csv=str(translation_csv))
+    module.translator = FakeTranslator()
+    yield module
+    module.close()
+
+def test_translate_item(translator):
+    """Test that curated translations are used first and Google Translate is the fallback."""
+    assert translator.translate_item('Burger') == 'Μπέργκερ'
+    assert translator.translate_item('Chicken Wrap') == 'el:Chicken Wrap'
+    assert translator.translator.requests == ['Chicken Wrap']
+
+def test_translate_items_bulk(translator):
+    """Test that repeated dictionary misses are sent to Google Translate only once."""
+    items = ['Burger', 'Chicken Wrap', 'Fries', 'Chicken Wrap']
+    assert translator.translate_items_bulk(items) == ['Μπέργκερ', 'el:Chicken Wrap', 'Πατάτες', 'el:Chicken Wrap']
+    assert translator.translator.requests == ['Chicken Wrap']
+
+def test_untranslated_item_falls_back_to_words(translator):
+    """Test that an item returned untranslated is translated word by word."""
+    translator.translator = FakeTranslator(untranslated={'McFlurry Oreo'})
+    assert translator.translate_items_bulk(['McFlurry Oreo']) == ['el:McFlurry el:Oreo']
+
+def test_google_translations_are_cached(translator):
+    """Test that words shared by several items are requested from Google Translate only once."""
+    translator.translator = FakeTranslator(untranslated={'Oreo McFlurry', 'Oreo Shake'})
+    assert translator.translate_items_bulk(['Oreo McFlurry', 'Oreo Shake']) == ['el:Oreo el:McFlurry', 'el:Oreo el:Shake']
+    assert sorted(translator.translator.requests) == ['McFlurry', 'Oreo', 'Oreo McFlurry', 'Oreo Shake', 'Shake']
+    assert translator.translate_item('Oreo Shake') == 'el:Oreo el:Shake'
+    assert len(translator.translator.requests) == 5
+
+def test_google_translate_retries(translator, monkeypatch):
+    """Test that a failed Google Translate request is retried, and given up on after max_retries attempts."""
+    monkeypatch.setattr('translator.time.sleep', lambda seconds: None)
+    translator.translator = FakeTranslator(failures=2)
+    assert translator.translate_item('Chicken Wrap') == 'el:Chicken Wrap'
+    assert translator.translator.requests == ['Chicken Wrap'] * 3
+
+    translator.translator = FakeTranslator(failures=3)
+    with pytest.raises(ConnectionError):
+        translator.translate_item('Fish Taco')
+
+def test_translate_series(translator):
+    """Test that a Series is translated with dictionary hits first and Google Translate for the rest."""
+    items = pd.Series(['Fries', 'Chicken Wrap', 'Burger'], index=[10, 11, 12])
+    translated = translator.translate_series(items)
+    assert translated.tolist() == ['Πατάτες', 'el:Chicken Wrap', 'Μπέργκερ']
+    assert translated.index.tolist() == [10, 11, 12]
+    assert translator.translator.requests == ['Chicken Wrap']
+
+def test_dictionary_lookup_is_normalized(translator):
+    """Test that spacing and capitalization variants of a curated item are resolved without Google Translate."""
+    assert translator.translate_item(' burger ') == 'Μπέργκερ'
+    assert translator.translate_items_bulk(['FRIES', 'Burger']) == ['Πατάτες', 'Μπέργκερ']
+    assert translator.translate_series(pd.Series(['fries', 'BURGER'])).tolist() == ['Πατάτες', 'Μπέργκερ']
+    assert translator.translator.requests == []
+
+def test_cloud_translate_batches(translator, monkeypatch):
+    """Test that the Cloud Translation client gets the dictionary misses in batches instead of one request per item."""
+    translator.cloud_project = 'project'
+    translator.cloud_client = FakeCloudClient()
+    monkeypatch.setattr(TranslatorModule, 'CLOUD_BATCH_SIZE', 2)
+    translated = translator.translate_items_bulk(['Burger', 'Wrap', 'Shake', 'Wrap', 'Salad'])
+    assert translated == ['Μπέργκερ', 'cloud:Wrap', 'cloud:Shake', 'cloud:Wrap', 'cloud:Salad']
+    assert translator.cloud_client.requests == [['Wrap', 'Shake'], ['Salad']]
+    assert translator.translator.requests == []
+
+def test_cloud_translate_batches_long_texts(translator, monkeypatch):
+    """Test that Cloud Translation batches are also closed on their total length, not only their number of texts."""
+    translator.cloud_project = 'project'
+    translator.cloud_client = FakeCloudClient()
+    monkeypatch.setattr(TranslatorModule, 'CLOUD_BATCH_CODEPOINTS', 100)
+    long_texts = [f"{i} " + 'x' * 40 for i in range(5)]
+    assert translator.translate_items_bulk(long_texts) == [f"cloud:{text}" for text in long_texts]
+    assert translator.cloud_client.requests == [long_texts[0:2], long_texts[2:4], long_texts[4:5]]
+    assert all(sum(map(len, batch)) <= 100 for batch in translator.cloud_client.requests)
+
+def test_googletrans_client_is_shared(tmp_path, monkeypatch):
+    """Test that concurrent requests all go through a single googletrans client, created on first use."""
+    clients = []
+    class SlowTranslator(FakeTranslator):
+        def __init__(self, **kwargs):
+            time.sleep(0.05)  # Give the other threads a chance to create their own client
+            super().__init__()
+            clients.append(self)
+    monkeypatch.setattr('googletrans.Translator', SlowTranslator)
+
+    translation_csv = tmp_path / 'translations.csv'
+    translation_csv.write_text('item,item_gr\n', encoding='utf-8')
+    module = TranslatorModule(connection=None, translation_csv=str(translation_csv))
+    try:
+        assert module.translate_items_bulk(['Wrap', 'Shake', 'Salad', 'Taco']) == ['el:Wrap', 'el:Shake', 'el:Salad', 'el:Taco']
+    finally:
+        module.close()
+    assert len(clients) == 1
+    assert sorted(clients[0].requests) == ['Salad', 'Shake', 'Taco', 'Wrap']
+    assert clients[0].client.closed
+
+def test_close_releases_clients(translator):
+    """Test that close closes the HTTP clients in use."""
+    translator.cloud_client = FakeCloudClient()
+    translator.close()
+    assert translator.translator.client.closed
+    assert translator.cloud_client.transport.closed
+
+def test_close_without_googletrans_client(tmp_path):
+    """Test that close doesn't create the googletrans client only to close it."""
+    translation_csv = tmp_path / 'translations.csv'
+    translation_csv.write_text('item,item_gr\n', encoding='utf-8')
+    module = TranslatorModule(connection=None, translation_csv=str(translation_csv))
+    module.close()
+    assert 'translator' not in module.__dict__
+
+def test_translation_dict_key_collisions(tmp_path, caplog):
+    """Test that curated entries merged by key normalization are reported when their translations differ."""
+    translation_csv = tmp_path / 'collisions.csv'
+    translation_csv.write_text('item,item_gr\nGrilled Chicken,Ψητό Κοτόπουλο\ngrilled chicken ,Κοτόπουλο Ψητό\n'
+                               'Fries,Πατάτες\nFRIES,Πατάτες\n', encoding='utf-8')
+    with caplog.at_level('WARNING'):
+        module = TranslatorModule(connection=None, translation_csv=str(translation_csv))
+        module.close()
+    assert module.dict_translations == {'grilled chicken': 'Κοτόπουλο Ψητό', 'fries': 'Πατάτες'}
+    assert len(caplog.records) == 1
+    assert "'grilled chicken '" in caplog.text and 'Ψητό Κοτόπουλο' in caplog.text
+
+def test_translation_dict_cache(translator, tmp_path):
+    """Test that the translation dictionary is cached next to the CSV and refreshed when the CSV changes."""
+    translation_csv = tmp_path / 'translations.csv'
+    cache_path = tmp_path / 'translations.csv.pkl'
+    assert cache_path.exists()
+    assert translator.load_translation_dict(str(translation_csv)) == {'burger': 'Μπέργκερ', 'fries': 'Πατάτες'}
+
+    # Changing the CSV contents invalidates the cache
+    translation_csv.write_text('item,item_gr\nShake,Μιλκσέικ\n', encoding='utf-8')
+    assert translator.load_translation_dict(str(translation_csv)) == {'shake': 'Μιλκσέικ'}
+    assert translator.load_translation_dict(str(translation_csv)) == {'shake': 'Μιλκσέικ'}
+
+    # A changed CSV is parsed again even if it looks older than the cache (e.g. restored with cp -p)
+    translation_csv.write_text('item,item_gr\nSoda,Αναψυκτικό\n', encoding='utf-8')
+    os.utime(translation_csv, (0, 0))
+    assert translator.load_translation_dict(str(translation_csv)) == {'soda': 'Αναψυκτικό'}
+
+def test_translation_dict_cache_hit_skips_parsing(translator, tmp_path, monkeypatch):
+    """Test that an up to date cache is loaded without parsing the CSV."""
+    def fail_parse(csv_path):
+        raise AssertionError('The CSV should not be parsed')
+    monkeypatch.setattr(translator, '_parse_translation_csv', fail_parse)
+    assert translator.load_translation_dict(str(tmp_path / 'translations.csv')) == {'burger': 'Μπέργκερ', 'fries': 'Πατάτες'}
+
+def test_translation_dict_cache_write_failure(translator, tmp_path, monkeypatch):
+    """Test that a failed cache write leaves neither a cache nor a temporary file behind."""
+    def fail_replace(src, dst):
+        raise OSError('Simulated write error')
+    (tmp_path / 'translations.csv.pkl').unlink()
+    monkeypatch.setattr('translator.os.replace', fail_replace)
+    assert translator.load_translation_dict(str(tmp_path / 'translations.csv')) == {'burger': 'Μπέργκερ', 'fries': 'Πατάτες'}
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['translations.csv']
+
+def test_available_memory_is_cached(translator, monkeypatch):
+    """Test that the available memory is read once per TTL instead of on every call."""
+    calls = []
+    def fake_virtual_memory():
+        calls.append(1)
+        return type('VirtualMemory', (), {'available': 2 * 1024 ** 3})()
+    monkeypatch.setattr('translator.psutil.virtual_memory', fake_virtual_memory)
+    assert translator.get_available_memory() == 2.0
+    assert translator.get_available_memory() == 2.0
+    assert len(calls) == 1
+    assert translator.get_available_memory(ttl=0) == 2.0
+    assert len(calls) == 2